@@ -1,18 +1,39 @@
 """CDS utilities used by ECMWF datasets."""
 
+import functools
+import json
+import queue
+from collections.abc import Callable
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+from contextlib import contextmanager
 from copy import copy
 from pathlib import Path
+from typing import Any
+from typing import BinaryIO
+from typing import Literal
 import cdsapi
+import dask
+import eccodes
+import h5netcdf
 import numpy as np
 import pandas as pd
+import requests
 import xarray as xr
 import yaml
+import zarr
+from numcodecs import Blosc
+from tenacity import retry
+from tenacity import retry_if_exception
+from tenacity import stop_after_attempt
+from tenacity import wait_exponential
 from tqdm import tqdm
-from tqdm.contrib.itertools import product
-from zampy.datasets import converter
 from zampy.datasets.dataset_protocol import SpatialBounds
 from zampy.datasets.dataset_protocol import TimeBounds
+from zampy.datasets.utils import DownloadCache
 from zampy.datasets.utils import get_file_size
+from zampy.datasets.utils import get_file_sizes
 from zampy.reference.variables import VARIABLE_REFERENCE_LOOKUP
 
 
@@ -60,6 +81,19 @@ SPLIT_VARIABLES = {
     ),
 }
 
+# Number of parallel retrievals. Raising this too far triggers the CDS fair-use limits.
+MAX_WORKERS = 4
+# Number of months of ERA5(-land) data that are requested at once.
+MONTHS_PER_REQUEST = 6
+# Number of files that are converted to zarr in parallel during ingestion.
+INGEST_WORKERS = 8
+# Time after which the requested data is assumed to be final. Preliminary ERA5 data
+#   (ERA5T) is published ~5 days behind real time, and replaced 2-3 months later.
+PUBLICATION_DELAY = np.timedelta64(90, "D")
+
+# Idle CDS API clients per (url, key), reused between requests and cds_request calls.
+_client_pool: dict[tuple[str, str], "queue.SimpleQueue[cdsapi.Client]"] = {}
+
 
 def cds_request(
     dataset: str,
@@ -69,6 +103,8 @@ def cds_request(
     path: Path,
     cds_var_names: dict[str, str],
     overwrite: bool,
+    *,
+    max_workers: int = MAX_WORKERS,
 ) -> None:
     """Download data via CDS API.
 
@@ -81,8 +117,9 @@ def cds_request(
 
     Given the efficiency tips of request for ERA5 and ERA5-land dataset,
     https://confluence.ecmwf.int/display/CKB/Climate+Data+Store+%28CDS%29+documentation
-    downloading is organized by asking for one month of data per request for ERA5 and
-    ERA5-land datasets.
+    downloading is organized by asking for (up to) six months of data per request for
+    ERA5 and ERA5-land datasets. These requests are submitted in parallel, to allow the
+    queueing on the CDS server and the downloads to overlap.
 
     Args:
         dataset: Dataset name for retrieval via `cdsapi`.
@@ -92,25 +129,19 @@ def cds_request(
         path: File path to which the data should be saved.
         cds_var_names: Variable names from CDS server side.
         overwrite: If an existing file (of the same size!) should be overwritten.
+        max_workers: Maximum number of requests sent to the CDS server at once.
     """
     fname = PRODUCT_FNAME[dataset]
 
     url, api_key = cds_api_key(fname)
 
-    # TODO: expose timeout, see issue 64
-    c = cdsapi.Client(
-        url=url,
-        key=api_key,
-        verify=True,
-        quiet=True,
-        timeout=300,
-    )
     # choose retrieve function
     retrieve_func = RETRIEVE_FUNCTION[fname]
 
     # start datasets retrieval
     retrieve_func(
-        c,
+        url,
+        api_key,
         fname,
         dataset,
         variables,
@@ -119,6 +150,7 @@ def cds_request(
         path,
         cds_var_names,
         overwrite,
+        max_workers=max_workers,
     )
 
 
@@ -146,13 +178,6 @@ def cds_request_land_cover(
 
     url, api_key = cds_api_key(fname)
 
-    c = cdsapi.Client(
-        url=url,
-        key=api_key,
-        verify=True,
-        quiet=True,
-    )
-
     years_months = time_bounds_to_year_month(time_bounds)
     years = {year for (year, _) in years_months}
 
@@ -164,23 +189,29 @@ def cds_request_land_cover(
             spatial_bounds.east,
         ]
 
+    file_sizes = get_file_sizes(path)
+    cached_sizes = DownloadCache(path).read()
     for year in tqdm(years):
         if int(year) < 2016:
             version = "v2_0_7cds"
         else:
             version = "v2_1_1"
-        r = c.retrieve(
-            dataset,
-            {
-                "variable": "all",
-                "format": "zip",
-                "year": year,
-                "version": version,
-                "area": area,
-            },
-        )
+        request = {
+            "variable": "all",
+            "format": "zip",
+            "year": year,
+            "version": version,
+            "area": area,
+        }
         fpath = path / f"{fname}_LCCS_MAP_300m_{year}.zip"
-        _check_and_download(r, fpath, overwrite)
+        if not overwrite and _is_downloaded(
+            dataset, request, fpath, file_sizes=file_sizes, cached_sizes=cached_sizes
+        ):
+            print(f"File '{fpath.name}' already exists, skipping...")
+        else:
+            _retrieve_and_download(
+                url, api_key, dataset, request, fpath, overwrite=overwrite
+            )
 
 
 def cds_api_key(product_name: str) -> tuple[str, str]:
@@ -201,13 +232,12 @@ def cds_api_key(product_name: str) -> tuple[str, str]:
     default_cdsapi_path = Path.home() / ".cdsapirc"
 
     if CONFIG_PATH.exists():
-        with CONFIG_PATH.open() as f:
-            config_zampy: dict = yaml.safe_load(f)
-            if server_api in config_zampy.keys():
-                url = config_zampy[server_api]["url"]
-                api_key = config_zampy[server_api]["key"]
-            else:
-                raise KeyError(f"No {server_api} key was found at '{CONFIG_PATH}'.")
+        config_zampy = _load_config(CONFIG_PATH, CONFIG_PATH.stat().st_mtime_ns)
+        if server_api in config_zampy.keys():
+            url = config_zampy[server_api]["url"]
+            api_key = config_zampy[server_api]["key"]
+        else:
+            raise KeyError(f"No {server_api} key was found at '{CONFIG_PATH}'.")
     elif default_cdsapi_path.exists():
         raise FileNotFoundError(
             f"No config file was found at '{CONFIG_PATH}'. Found `.cdsapirc` file at "
@@ -225,8 +255,19 @@ def cds_api_key(product_name: str) -> tuple[str, str]:
     return url, api_key
 
 
+@functools.lru_cache(maxsize=8)
+def _load_config(path: Path, mtime_ns: int) -> dict:
+    """Load the zampy config file.
+
+    The modification time is part of the cache key, so edits to the file are picked up.
+    """
+    with path.open() as f:
+        return yaml.safe_load(f)
+
+
 def retrieve_era5(
-    client: cdsapi.Client,
+    url: str,
+    api_key: str,
     fname: str,
     dataset: str,
     variables: list[str],
@@ -235,14 +276,24 @@ def retrieve_era5(
     path: Path,
     cds_var_names: dict[str, str],
     overwrite: bool,
+    *,
+    max_workers: int = MAX_WORKERS,
+    months_per_request: int = MONTHS_PER_REQUEST,
 ) -> None:
     """Retrieve details of era5 and era5-land request.
 
     Note that all hours in a day are covered and all days for the given
-    month are included for downloading.
+    months are included for downloading. The months which were not downloaded before
+    are combined into requests of up to `months_per_request` months of the same year,
+    to reduce the number of requests in the queue. The downloaded data is split into
+    one file per month, so the files do not depend on how the months were requested.
+
+    The data is requested in GRIB format, as this avoids the (slow) server-side
+    conversion to netCDF. The files are converted to zarr on ingestion.
 
     Args:
-        client: CDS API client.
+        url: URL of the CDS server.
+        api_key: CDS API key.
         fname: Dataset name alias.
         dataset: Dataset name for retrieval via `cdsapi`.
         variables: Zampy variables.
@@ -251,44 +302,72 @@ def retrieve_era5(
         path: File path to which the data should be saved.
         cds_var_names: Variable names from CDS server side.
         overwrite: If an existing file (of the same size!) should be overwritten.
+        max_workers: Maximum number of requests sent to the CDS server at once.
+        months_per_request: Maximum number of months requested in a single request.
     """
-    # create list of year/month pairs
-    year_month_pairs = time_bounds_to_year_month(time_bounds)
-
     variables = copy(variables)  # Prevent original input from being modified in-place
     for split_var in SPLIT_VARIABLES:
         if split_var in variables:
             variables.remove(split_var)
             variables.extend(SPLIT_VARIABLES[split_var])
 
-    for (year, month), variable in product(
-        year_month_pairs, variables, position=0, leave=True
-    ):
-        # raise download request
-        r = client.retrieve(
-            dataset,
-            {
-                "product_type": "reanalysis",
-                "variable": [cds_var_names[variable]],
-                "year": year,
-                "month": month,
-                "day": ALL_DAYS,
-                "time": ALL_HOURS,
-                "area": [
-                    spatial_bounds.north,
-                    spatial_bounds.west,
-                    spatial_bounds.south,
-                    spatial_bounds.east,
-                ],
-                "format": "netcdf",
-            },
-        )
-        fpath = path / f"{fname}_{variable}_{year}-{month}.nc"
-        _check_and_download(r, fpath, overwrite)
+    file_sizes = get_file_sizes(path)
+    cached_sizes = DownloadCache(path).read()
+
+    tasks: list[Callable[[], None]] = []
+    for variable in variables:
+        request = {
+            "product_type": "reanalysis",
+            "variable": [cds_var_names[variable]],
+            "day": ALL_DAYS,
+            "time": ALL_HOURS,
+            "area": [
+                spatial_bounds.north,
+                spatial_bounds.west,
+                spatial_bounds.south,
+                spatial_bounds.east,
+            ],
+            "format": "grib",
+        }
+
+        pending_months = []
+        for year, month in time_bounds_to_year_month(time_bounds):
+            fpath = path / f"{fname}_{variable}_{year}-{month}.grib"
+            month_request = request | {"year": year, "month": [month]}
+            if not overwrite and _is_downloaded(
+                dataset,
+                month_request,
+                fpath,
+                file_sizes=file_sizes,
+                cached_sizes=cached_sizes,
+            ):
+                print(f"File '{fpath.name}' already exists, skipping...")
+            else:
+                pending_months.append((year, month))
+
+        for year, months in group_year_months(pending_months, months_per_request):
+            tasks.append(
+                functools.partial(
+                    _retrieve_and_download,
+                    url,
+                    api_key,
+                    dataset,
+                    request | {"year": year, "month": months},
+                    path / f"{fname}_{variable}_{year}-{months[0]}-{months[-1]}.part",
+                    overwrite=overwrite,
+                    month_paths={
+                        month: path / f"{fname}_{variable}_{year}-{month}.grib"
+                        for month in months
+                    },
+                )
+            )
+
+    _retrieve_parallel(tasks, max_workers=max_workers)
 
 
 def retrieve_cams(
-    client: cdsapi.Client,
+    url: str,
+    api_key: str,
     fname: str,
     dataset: str,
     variables: list[str],
@@ -297,13 +376,16 @@ def retrieve_cams(
     path: Path,
     cds_var_names: dict[str, str],
     overwrite: bool,
+    *,
+    max_workers: int = MAX_WORKERS,
 ) -> None:
     """Download CAMS EGG4 data via ADS API.
 
     Note that the model level is set to "60" and all steps are included for downloading.
 
     Args:
-        client: CDS API client.
+        url: URL of the ADS server.
+        api_key: ADS API key.
         fname: Dataset name alias.
         dataset: Dataset name for retrieval via `cdsapi`.
         variables: Zampy variables.
@@ -312,33 +394,51 @@ def retrieve_cams(
         path: File path to which the data should be saved.
         cds_var_names: Variable names from CDS server side.
         overwrite: If an existing file (of the same size!) should be overwritten.
+        max_workers: Maximum number of requests sent to the ADS server at once.
     """
     # make sure time format is YY-MM-DD
     time_start = str(np.datetime_as_string(time_bounds.start, unit="D"))  # please mypy
     time_end = str(np.datetime_as_string(time_bounds.end, unit="D"))
-    # raise download request
-    for variable in tqdm(variables):
-        r = client.retrieve(
-            dataset,
-            {
-                "model_level": "60",
-                "variable": [cds_var_names[variable]],
-                "date": f"{time_start}/{time_end}",
-                "step": ["0", "3", "6", "9", "12", "15", "18", "21"],
-                "area": [
-                    spatial_bounds.north,
-                    spatial_bounds.west,
-                    spatial_bounds.south,
-                    spatial_bounds.east,
-                ],
-                "format": "netcdf",
-            },
-        )
-        time_start = time_start.replace("-", "_")
-        time_end = time_end.replace("-", "_")
-        # check existence and overwrite
-        fpath = path / f"{fname}_{variable}_{time_start}-{time_end}.nc"
-        _check_and_download(r, fpath, overwrite)
+    fname_start = time_start.replace("-", "_")
+    fname_end = time_end.replace("-", "_")
+
+    file_sizes = get_file_sizes(path)
+    cached_sizes = DownloadCache(path).read()
+
+    tasks: list[Callable[[], None]] = []
+    for variable in variables:
+        request = {
+            "model_level": "60",
+            "variable": [cds_var_names[variable]],
+            "date": f"{time_start}/{time_end}",
+            "step": ["0", "3", "6", "9", "12", "15", "18", "21"],
+            "area": [
+                spatial_bounds.north,
+                spatial_bounds.west,
+                spatial_bounds.south,
+                spatial_bounds.east,
+            ],
+            "format": "netcdf",
+        }
+        fpath = path / f"{fname}_{variable}_{fname_start}-{fname_end}.nc"
+        if not overwrite and _is_downloaded(
+            dataset, request, fpath, file_sizes=file_sizes, cached_sizes=cached_sizes
+        ):
+            print(f"File '{fpath.name}' already exists, skipping...")
+        else:
+            tasks.append(
+                functools.partial(
+                    _retrieve_and_download,
+                    url,
+                    api_key,
+                    dataset,
+                    request,
+                    fpath,
+                    overwrite=overwrite,
+                )
+            )
+
+    _retrieve_parallel(tasks, max_workers=max_workers)
 
 
 RETRIEVE_FUNCTION = {
@@ -348,6 +448,147 @@ RETRIEVE_FUNCTION = {
 }
 
 
+def _retrieve_parallel(tasks: list[Callable[[], None]], *, max_workers: int) -> None:
+    """Run the download tasks, to send their requests to the CDS server in parallel."""
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = [executor.submit(task) for task in tasks]
+        with tqdm(total=len(futures), position=0, leave=True) as progress_bar:
+            for future in as_completed(futures):
+                future.result()  # re-raise any exception from the worker
+                progress_bar.update()
+    except BaseException:
+        # Raise errors (or a KeyboardInterrupt) directly, instead of first waiting for
+        #   all queued requests to finish.
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+
+
+def _is_transient_error(error: BaseException) -> bool:
+    """Check if a failed request is worth retrying.
+
+    Only rate limiting (HTTP 429), server errors (HTTP 5xx) and connection problems
+    are retried. Other errors (e.g. an invalid request or invalid credentials) will
+    fail again, and are raised directly.
+    """
+    if isinstance(error, requests.exceptions.HTTPError):
+        status = getattr(error.response, "status_code", None)
+        return status is not None and (status == 429 or status >= 500)
+    return isinstance(
+        error, requests.exceptions.ConnectionError | requests.exceptions.Timeout
+    )
+
+
+@retry(
+    retry=retry_if_exception(_is_transient_error),
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=10),
+    reraise=True,
+)
+def _retrieve_and_download(
+    url: str,
+    api_key: str,
+    dataset: str,
+    request: dict[str, Any],
+    fpath: Path,
+    *,
+    overwrite: bool,
+    month_paths: dict[str, Path] | None = None,
+) -> None:
+    """Raise a single request and download the result (retried on transient errors).
+
+    The content length of completed downloads is cached, so that a next time the file
+    can be skipped without waiting in the CDS queue again (see `_is_downloaded`). Data
+    which can still change (see `_is_final`) is not cached, and is checked every time.
+
+    If `month_paths` is given, the downloaded (GRIB) file is split into a file per
+    month of the request instead, which are then cached separately.
+    """
+    with _pooled_client(url, api_key) as client:
+        r = client.retrieve(dataset, request)
+        _check_and_download(r, fpath, overwrite)
+    if get_file_size(fpath) != r.content_length:
+        return
+
+    if month_paths is None:
+        downloads = {fpath: request}
+    else:
+        split_grib_months(fpath, month_paths)
+        fpath.unlink()
+        downloads = {
+            month_path: request | {"month": [month]}
+            for month, month_path in month_paths.items()
+            if month_path.exists()
+        }
+    for download, download_request in downloads.items():
+        if _is_final(download_request):
+            DownloadCache(download.parent).set(
+                _download_cache_key(dataset, download_request), get_file_size(download)
+            )
+
+
+def _is_downloaded(
+    dataset: str,
+    request: dict[str, Any],
+    fpath: Path,
+    *,
+    file_sizes: dict[Path, int],
+    cached_sizes: dict[str, int],
+) -> bool:
+    """Check if the file of this request was completely downloaded before.
+
+    `file_sizes` holds the sizes of the files in the download folder (see
+    `get_file_sizes`), and `cached_sizes` the content of its download cache (see
+    `DownloadCache.read`). Both are read once for all files, instead of per file.
+    """
+    cached_size = cached_sizes.get(_download_cache_key(dataset, request))
+    return cached_size == file_sizes.get(fpath, 0)
+
+
+def _is_final(request: dict[str, Any]) -> bool:
+    """Check if the period of the request is past the publication delay of the data.
+
+    Data of more recent periods can still be added or replaced on the CDS server.
+    """
+    if "date" in request:  # "start/end" dates, e.g. CAMS
+        end = np.datetime64(request["date"].split("/")[-1], "D") + 1
+    else:  # year, with the months for ERA5(-land)
+        last_month = max(int(month) for month in request.get("month", ["12"]))
+        end = np.datetime64(f"{request['year']}-{last_month:02d}", "M") + 1
+    return end.astype("datetime64[D]") + PUBLICATION_DELAY <= np.datetime64("today")
+
+
+def _download_cache_key(dataset: str, request: dict[str, Any]) -> str:
+    return json.dumps([dataset, request], sort_keys=True)
+
+
+@contextmanager
+def _pooled_client(url: str, api_key: str) -> Iterator[cdsapi.Client]:
+    """Check out a CDS API client from the pool, creating one if none is idle.
+
+    `cdsapi.Client` is not thread-safe, so a client is used by one thread at a time.
+    Returning it to the pool afterwards allows the (already set up) client to be
+    reused by later requests.
+    """
+    pool = _client_pool.setdefault((url, api_key), queue.SimpleQueue())
+    try:
+        client = pool.get_nowait()
+    except queue.Empty:
+        # TODO: expose timeout, see issue 64
+        client = cdsapi.Client(
+            url=url,
+            key=api_key,
+            verify=True,
+            quiet=True,
+            timeout=300,
+        )
+    try:
+        yield client
+    finally:
+        pool.put(client)
+
+
 def _check_and_download(
     retrieval: cdsapi.Client.retrieve, fpath: Path, overwrite: bool
 ) -> None:
@@ -360,43 +601,157 @@ def _check_and_download(
 
 
 def time_bounds_to_year_month(time_bounds: TimeBounds) -> list[tuple[str, str]]:
-    """Return year/month pairs."""
-    date_range = pd.date_range(start=time_bounds.start, end=time_bounds.end, freq="ME")
-    year_month_pairs = [(str(date.year), str(date.month)) for date in date_range]
-    return year_month_pairs
+    """Return year/month pairs of all months overlapping with the time bounds."""
+    months = pd.period_range(start=time_bounds.start, end=time_bounds.end, freq="M")
+    years = months.year.astype(str).tolist()
+    return list(zip(years, months.month.astype(str).tolist(), strict=True))
+
+
+def group_year_months(
+    year_months: list[tuple[str, str]], group_size: int = MONTHS_PER_REQUEST
+) -> list[tuple[str, list[str]]]:
+    """Group year/month pairs into years with up to `group_size` of their months."""
+    groups: list[tuple[str, list[str]]] = []
+    for year, month in year_months:
+        if groups and groups[-1][0] == year and len(groups[-1][1]) < group_size:
+            groups[-1][1].append(month)
+        else:
+            groups.append((year, [month]))
+    return groups
+
+
+def split_grib_months(fpath: Path, month_paths: dict[str, Path]) -> None:
+    """Split a GRIB file into a file per month (of the validity time of the data).
+
+    Args:
+        fpath: Path of the GRIB file.
+        month_paths: Path of the output file of each month, e.g. {"1": Path(...)}.
+    """
+    tmp_paths = {
+        month: path.with_suffix(".part") for month, path in month_paths.items()
+    }
+    files: dict[str, BinaryIO] = {}
+    try:
+        with fpath.open("rb") as f:
+            while (message := eccodes.codes_grib_new_from_file(f)) is not None:
+                try:
+                    month = str(eccodes.codes_get(message, "validityDate") // 100 % 100)
+                    if month not in files:
+                        files[month] = tmp_paths[month].open("wb")
+                    eccodes.codes_write(message, files[month])
+                finally:
+                    eccodes.codes_release(message)
+    finally:
+        for file in files.values():
+            file.close()
+    # only replace the monthly files once complete, as they are skipped by their size
+    for month in files:
+        tmp_paths[month].replace(month_paths[month])
+
+
+# Chunk sizes of the ingested (zarr) files, for the expected access pattern.
+#   Dimensions missing from a file are ignored. ECMWF data uses "valid_time" as time.
+INGEST_CHUNKS = {
+    "timeseries": {"time": -1, "valid_time": -1, "latitude": 32, "longitude": 32},
+    "spatial": {"time": 24, "valid_time": 24, "latitude": -1, "longitude": -1},
+}
 
 
 def convert_to_zampy(
     ingest_folder: Path,
     file: Path,
     overwrite: bool = False,
+    rechunk_for: Literal["timeseries", "spatial"] = "timeseries",
+    chunks: dict[str, int] | None = None,
 ) -> None:
-    """Convert the downloaded nc files to standard CF/Zampy netCDF files.
+    """Convert the downloaded nc/grib files to standard CF/Zampy zarr stores.
 
     The downloaded ERA5/ERA5-land data already follows CF1.6 convention. However,
     it uses (abbreviated) variable name instead of standard name, which prohibits
     the format conversion. Therefore we need to ingest the downloaded files and
     rename all variables to standard names.
 
+    The ingested data is stored as (zstd compressed) zarr, of which the chunks can be
+    read in parallel when loading the data. The chunks are also written in parallel,
+    by the active dask scheduler (e.g. the workers of a `dask.distributed.Client`),
+    without the file locking or MPI build that parallel HDF5 writes need.
+    By default the data is rechunked to have the full time range of the file in a
+    single chunk, as zampy mostly extracts time series of (small) regions.
+
     Args:
         ingest_folder: Folder where the files have to be written to.
-        file: Path to the ERA5 nc file.
+        file: Path to the ERA5 nc or grib file.
         overwrite: Overwrite all existing files. If False, file that already exist will
             be skipped.
+        rechunk_for: Access pattern the written zarr store is chunked for, either
+            "timeseries" or "spatial" (see `INGEST_CHUNKS`).
+        chunks: Chunk sizes of the written zarr store. Overrides `rechunk_for`.
     """
-    ncfile = ingest_folder / file.with_suffix(".nc").name
-    if ncfile.exists() and not overwrite:
-        print(f"File '{ncfile.name}' already exists, skipping...")
+    # Rename the vswl data:
+    zarr_name = file.with_suffix(".zarr").name.replace(
+        "volumetric_soil_water", "soil_moisture"
+    )
+    zarr_store = ingest_folder / zarr_name
+    if zarr_store.exists() and not overwrite:
+        print(f"File '{zarr_store.name}' already exists, skipping...")
     else:
-        ds = parse_nc_file(file)
-        # Rename the vswl data:
-        ncfile = Path(str(ncfile).replace("volumetric_soil_water", "soil_moisture"))
-        ds.to_netcdf(path=ncfile, engine="h5netcdf")
+        chunks = INGEST_CHUNKS[rechunk_for] if chunks is None else chunks
+        # Read with the chunks of the store, so every chunk is read, converted and
+        #   written on its own, instead of holding (large parts of) the file in memory.
+        ds = parse_nc_file(file, chunks=chunks)
+        ds = ds.chunk({dim: size for dim, size in chunks.items() if dim in ds.dims})
+        compressor = Blosc(cname="zstd", clevel=3, shuffle=Blosc.BITSHUFFLE)
+        # zarr-python 3 takes a tuple of compressors, zarr-python 2 a single one.
+        if int(zarr.__version__.split(".")[0]) >= 3:
+            compression = {"compressors": (compressor,)}
+        else:
+            compression = {"compressor": compressor}
+        ds.to_zarr(
+            zarr_store,
+            mode="w",
+            zarr_format=2,  # consolidated metadata is not part of the v3 spec
+            consolidated=True,
+            encoding={var: dict(compression) for var in ds.data_vars},
+        )
+
+
+def convert_many(
+    ingest_folder: Path,
+    files: list[Path],
+    overwrite: bool = False,
+    *,
+    rechunk_for: Literal["timeseries", "spatial"] = "timeseries",
+    chunks: dict[str, int] | None = None,
+    num_workers: int = INGEST_WORKERS,
+) -> None:
+    """Convert multiple downloaded nc/grib files to zarr stores in parallel.
+
+    Each file is opened, parsed and written in its own thread, so the reading of one
+    file overlaps with the (compression and) writing of another.
+
+    Args:
+        ingest_folder: Folder where the files have to be written to.
+        files: Paths to the ERA5 nc or grib files.
+        overwrite: Overwrite all existing files. If False, file that already exist will
+            be skipped.
+        rechunk_for: Access pattern the written zarr stores are chunked for, either
+            "timeseries" or "spatial" (see `INGEST_CHUNKS`).
+        chunks: Chunk sizes of the written zarr stores. Overrides `rechunk_for`.
+        num_workers: Number of files that are converted at the same time.
+    """
+    tasks = [
+        dask.delayed(convert_to_zampy, pure=False)(
+            ingest_folder, file, overwrite, rechunk_for=rechunk_for, chunks=chunks
+        )
+        for file in files
+    ]
+    dask.compute(*tasks, scheduler="threads", num_workers=num_workers)
 
 
 var_reference_ecmwf_to_zampy = {
     # era5 variables
     "mtpr": "total_precipitation",
+    "avg_tprate": "total_precipitation",  # mtpr, as named by newer ecCodes versions
     "strd": "surface_thermal_radiation_downwards",
     "ssrd": "surface_solar_radiation_downwards",
     "sp": "surface_pressure",
@@ -433,47 +788,108 @@ LAYER_BOUNDS = {
 
 WATER_DENSITY = 997.0  # kg/m3
 
+# accumulated radiation variables, stored in J/m2 by ECMWF
+_RADIATION_VARS = frozenset(
+    {"surface_solar_radiation_downwards", "surface_thermal_radiation_downwards"}
+)
+
+# float32 scaling factors, to prevent upcasting the (float32) data to float64.
+_INV_3600 = np.float32(1 / 3600)  # J/m2 per hour to W/m2
+_KG_M2S_TO_MM_S = np.float32(1000 / WATER_DENSITY)  # via m/s
+_WATER_DENSITY = np.float32(WATER_DENSITY)
 
-def parse_nc_file(file: Path) -> xr.Dataset:
-    """Parse the downloaded ERA5 nc files, to CF/Zampy standard dataset.
+
+def open_raw_file(file: Path, chunks: dict[str, int] | None = None) -> xr.Dataset:
+    """Open a downloaded netCDF or GRIB file, or an ingested zarr store.
+
+    GRIB files are opened with a single `valid_time` dimension (instead of cfgrib's
+    default of `time` and `step`), to match the netCDF files served by CDS.
 
     Args:
-        file: Path to the ERA5 nc file.
+        file: Path to the nc or grib file, or the zarr store.
+        chunks: Dask chunk sizes to open the nc or grib file with. By default the time
+            axis is kept whole. Zarr stores are opened with their own chunks.
 
     Returns:
-        CF/Zampy formatted xarray Dataset
+        The (lazily loaded) dataset.
     """
     # Open chunked: will be dask array -> file writing can be parallelized.
-    ds = xr.open_dataset(file, chunks={"x": 50, "y": 50}, engine="h5netcdf")
+    #   The files contain (at most) a few months of data, keep the time axis whole.
+    if chunks is None:
+        chunks = {"time": -1, "valid_time": -1, "latitude": 64, "longitude": 64}
+    if file.suffix == ".grib":
+        ds = xr.open_dataset(
+            file,
+            chunks=chunks,
+            engine="cfgrib",
+            backend_kwargs={"time_dims": ("valid_time",), "indexpath": ""},
+        )
+        # Drop cfgrib's auxiliary coordinates (e.g. "number", "step", "surface").
+        return ds.reset_coords(drop=True)
+    if file.suffix == ".zarr":
+        return xr.open_zarr(file)
+    return xr.open_dataset(
+        file,
+        chunks=chunks,
+        engine="h5netcdf",
+        drop_variables=_unused_variables(file),
+    )
 
-    for variable in ds.variables:
-        if variable in var_reference_ecmwf_to_zampy:
-            var = str(variable)  # Cast to string to please mypy
-            variable_name = var_reference_ecmwf_to_zampy[var]
-            ds = ds.rename({var: variable_name})
-            # convert radiation to flux J/m2 to W/m2
-            # https://confluence.ecmwf.int/pages/viewpage.action?pageId=155337784
-            if variable_name in (
-                "surface_solar_radiation_downwards",
-                "surface_thermal_radiation_downwards",
-            ):
-                ds[variable_name] = ds[variable_name] / 3600
-            # conversion precipitation kg/m2s to mm/s
-            elif variable_name == "total_precipitation":
-                ds[variable_name] = ds[variable_name] / WATER_DENSITY
-                ds[variable_name].attrs["units"] = "meter_per_second"
-                # convert from m/s to mm/s
-                ds = converter._convert_var(
-                    ds, variable_name, VARIABLE_REFERENCE_LOOKUP[variable_name].unit
-                )
 
-            ds[variable_name].attrs["units"] = str(
-                VARIABLE_REFERENCE_LOOKUP[variable_name].unit
-            )
-            ds[variable_name].attrs["description"] = VARIABLE_REFERENCE_LOOKUP[
-                variable_name
-            ].desc
+def _unused_variables(file: Path) -> list[str]:
+    """List the variables in a netCDF file which are not used by zampy.
+
+    Only the metadata is read. Dimension coordinates are always kept.
+    """
+    with h5netcdf.File(file, "r") as f:
+        return [
+            name
+            for name in f.variables
+            if name not in f.dimensions
+            and name not in var_reference_ecmwf_to_zampy
+            and name not in VAR_REFERENCE_MULTI_LAYER
+        ]
+
+
+def parse_nc_file(file: Path, chunks: dict[str, int] | None = None) -> xr.Dataset:
+    """Parse the downloaded ERA5 nc or grib files, to CF/Zampy standard dataset.
+
+    Args:
+        file: Path to the ERA5 nc or grib file.
+        chunks: Dask chunk sizes to open the file with (see `open_raw_file`).
+
+    Returns:
+        CF/Zampy formatted xarray Dataset
+    """
+    # ERA5 data is stored with (less than) single precision, float32 halves the memory
+    #   traffic of the conversions below compared to float64.
+    ds = open_raw_file(file, chunks=chunks).astype("float32", copy=False)
+
+    # Rename all variables at once, renaming one by one rebuilds the dataset each time.
+    rename_map: dict[str, str] = {}
+    for variable in ds.variables:
+        name = var_reference_ecmwf_to_zampy.get(str(variable))
+        if name is not None:
+            rename_map[str(variable)] = name
+    ds = ds.rename(rename_map)
+
+    for variable_name in rename_map.values():
+        # convert radiation to flux J/m2 to W/m2
+        # https://confluence.ecmwf.int/pages/viewpage.action?pageId=155337784
+        if variable_name in _RADIATION_VARS:
+            ds[variable_name] = ds[variable_name] * _INV_3600
+        # conversion precipitation kg/m2s to mm/s, in a single pass over the data
+        elif variable_name == "total_precipitation":
+            ds[variable_name] = ds[variable_name] * _KG_M2S_TO_MM_S
+
+        ds[variable_name].attrs["units"] = str(
+            VARIABLE_REFERENCE_LOOKUP[variable_name].unit
+        )
+        ds[variable_name].attrs["description"] = VARIABLE_REFERENCE_LOOKUP[
+            variable_name
+        ].desc
 
+    for variable in list(ds.variables):
         if variable in VAR_REFERENCE_MULTI_LAYER:
             if (  # Soil temperature/moisture routine
                 str(variable).startswith("stl") or str(variable).startswith("swvl")
@@ -481,7 +897,7 @@ def parse_nc_file(file: Path) -> xr.Dataset:
                 if str(variable).startswith("swvl"):
                     varname = "soil_moisture"
                     standard_name = "moisture_content_of_soil_layer"
-                    ds[variable] *= WATER_DENSITY
+                    ds[variable] *= _WATER_DENSITY
                     ds[variable].attrs.update({"units": "kg m**-3"})
                 else:
                     varname = "soil_temperature"
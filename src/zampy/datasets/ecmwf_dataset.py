@@ -1,6 +1,7 @@
 """Base module for datasets available on CDS."""
 
 from pathlib import Path
+from typing import Literal
 import xarray as xr
 import xarray_regrid  # noqa: F401
 from zampy.datasets import cds_utils
@@ -87,20 +88,31 @@ class ECMWFDataset:  # noqa: D101
         download_dir: Path,
         ingest_dir: Path,
         overwrite: bool = False,
+        *,
+        rechunk_for: Literal["timeseries", "spatial"] = "timeseries",
+        chunks: dict[str, int] | None = None,
     ) -> bool:
         download_folder = download_dir / self.name
         ingest_folder = ingest_dir / self.name
         ingest_folder.mkdir(parents=True, exist_ok=True)
 
-        data_file_pattern = f"{self.name}_*.nc"
-        data_files = list(download_folder.glob(data_file_pattern))
-
-        for file in data_files:
-            cds_utils.convert_to_zampy(
-                ingest_folder,
-                file=file,
-                overwrite=overwrite,
-            )
+        data_files = list(download_folder.glob(f"{self.name}_*.grib"))
+        # netCDF files downloaded by older versions of zampy are skipped if the same
+        #   month was downloaded again as GRIB, as their data would overlap.
+        grib_stems = {file.stem for file in data_files}
+        data_files += [
+            file
+            for file in download_folder.glob(f"{self.name}_*.nc")
+            if file.stem not in grib_stems
+        ]
+
+        cds_utils.convert_many(
+            ingest_folder,
+            files=data_files,
+            overwrite=overwrite,
+            rechunk_for=rechunk_for,
+            chunks=chunks,
+        )
 
         copy_properties_file(download_folder, ingest_folder)
 
@@ -117,11 +129,12 @@ class ECMWFDataset:  # noqa: D101
         files: list[Path] = []
         for var in self.variable_names:
             if var in variable_names:
-                files += (ingest_dir / self.name).glob(f"{self.name}_{var}*.nc")
+                files += _find_ingested_files(
+                    ingest_dir / self.name, f"{self.name}_{var}*"
+                )
 
-        ds = xr.open_mfdataset(
-            files, chunks={"latitude": 200, "longitude": 200}, engine="h5netcdf"
-        )
+        # use the chunks of the ingested stores, to read every chunk only once
+        ds = xr.open_mfdataset(files, chunks={}, engine="zarr")
 
         # rename valid_time to time
         if "valid_time" in ds.dims:
@@ -147,17 +160,32 @@ class ECMWFDataset:  # noqa: D101
         converter.check_convention(convention)
         ingest_folder = ingest_dir / self.name
 
-        data_file_pattern = f"{self.name}_*.nc"
-
-        data_files = list(ingest_folder.glob(data_file_pattern))
+        data_files = _find_ingested_files(ingest_folder, f"{self.name}_*")
 
         for file in data_files:
             # start conversion process
             print(f"Start processing file `{file.name}`.")
-            ds = xr.open_dataset(file, chunks={"x": 50, "y": 50}, engine="h5netcdf")
+            ds = xr.open_zarr(file)
             ds = converter.convert(ds, dataset=self, convention=convention)
             # TODO: support derived variables
             # TODO: other calculations
             # call ds.compute()
 
         return True
+
+
+def _find_ingested_files(ingest_folder: Path, pattern: str) -> list[Path]:
+    """Find the ingested zarr stores matching the (suffix-less) glob pattern.
+
+    Raises:
+        FileNotFoundError: If only netCDF files are found, which were ingested by an
+            older version of zampy.
+    """
+    files = list(ingest_folder.glob(f"{pattern}.zarr"))
+    if not files and any(ingest_folder.glob(f"{pattern}.nc")):
+        raise FileNotFoundError(
+            f"Only netCDF files were found in '{ingest_folder}'. These were ingested "
+            "by an older version of zampy, ECMWF data is now ingested as zarr stores. "
+            "Please ingest the data again."
+        )
+    return files
@@ -1,29 +1,93 @@
 """Shared utilities from datasets."""
 
-import urllib.request
+import json
+import os
+import threading
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
 from pathlib import Path
+from typing import Any
 import requests
 import xarray_regrid
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
 from zampy.datasets.dataset_protocol import SpatialBounds
 
 
-class TqdmUpdate(tqdm):
-    """Wrap a tqdm progress bar to be updateable by urllib.request.urlretrieve."""
+CACHE_FNAME = ".zampy_cache.json"
+# Time after which a cached (complete) download is checked with the server again.
+CACHE_MAX_AGE = timedelta(days=30)
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
 
-    def update_to(
-        self, b: int = 1, bsize: int = 1, tsize: int | None = None
-    ) -> bool | None:
-        """Update the progress bar.
+# Shared session: keeps the connections alive between the HEAD and GET requests, and
+#   between the files downloaded from the same server.
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_maxsize=16))
+_SESSION.mount("https://", HTTPAdapter(pool_maxsize=16))
+
+
+class DownloadCache:
+    """Persistent record of the size of completely downloaded files.
+
+    The sizes are stored in a json file in the download folder, and are used to skip
+    files which were already downloaded without asking the server again. Entries
+    expire after `CACHE_MAX_AGE`, after which the file is checked with the server
+    again.
+    """
+
+    _lock = threading.Lock()  # The cache is shared between download threads.
+
+    def __init__(self, folder: Path) -> None:
+        """Init.
 
         Args:
-            b: Number of blocks transferred so far.
-            bsize: Size of each block (in tqdm units).
-            tsize: Total size (in tqdm units). If `None`, remains unchanged.
+            folder: Download folder in which the cache file is stored.
+        """
+        self.path = folder / CACHE_FNAME
+
+    def get(self, key: str) -> int | None:
+        """Return the cached content length for this key, if available."""
+        return self.read().get(key)
+
+    def read(self) -> dict[str, int]:
+        """Return all cached content lengths, to check many files with a single read."""
+        with self._lock:
+            entries = self._read()
+        return {key: entry["content_length"] for key, entry in entries.items()}
+
+    def set(self, key: str, content_length: int) -> None:
+        """Store the content length of a completely downloaded file."""
+        with self._lock:
+            entries = self._read()
+            entries[key] = {
+                "content_length": content_length,
+                "cached": datetime.now(timezone.utc).isoformat(),
+            }
+            # Write to a temporary file first, so that an interrupted write does not
+            #   leave a truncated cache file behind.
+            tmp_path = self.path.with_name(f"{CACHE_FNAME}.{os.getpid()}.tmp")
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump({"downloads": entries}, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+    def _read(self) -> dict[str, dict[str, Any]]:
+        """Read the unexpired cache entries.
+
+        A missing or unreadable cache (e.g. written by an older version of zampy) is
+        treated as empty.
         """
-        if tsize is not None:
-            self.total = tsize
-        return self.update(b * bsize - self.n)
+        oldest = datetime.now(timezone.utc) - CACHE_MAX_AGE
+        try:
+            with self.path.open(encoding="utf-8") as f:
+                entries = json.load(f)["downloads"]
+            return {
+                key: entry
+                for key, entry in entries.items()
+                if datetime.fromisoformat(entry["cached"]) > oldest
+            }
+        except (OSError, ValueError, LookupError, TypeError, AttributeError):
+            return {}
 
 
 def download_url(url: str, fpath: Path, overwrite: bool) -> None:
@@ -34,18 +98,35 @@ def download_url(url: str, fpath: Path, overwrite: bool) -> None:
         fpath: File path to which the URL should be saved.
         overwrite: If an existing file (of the same size!) should be overwritten.
     """
-    if get_file_size(fpath) != get_url_size(url) or overwrite:
-        with TqdmUpdate(
-            unit="B", unit_scale=True, miniters=1, desc=url.split("/")[-1]
-        ) as t:
-            urllib.request.urlretrieve(url, filename=fpath, reporthook=t.update_to)
-    else:
+    cache = DownloadCache(fpath.parent)
+    file_size = get_file_size(fpath)
+    if not overwrite and file_size == cache.get(url):
+        print(f"File '{fpath.name}' already exists, skipping...")
+    elif not overwrite and file_size == get_url_size(url):
         print(f"File '{fpath.name}' already exists, skipping...")
+        cache.set(url, file_size)  # complete file, which was not cached yet
+    else:
+        with _SESSION.get(url, stream=True) as response:
+            response.raise_for_status()
+            with (
+                fpath.open("wb") as f,
+                tqdm(
+                    total=int(response.headers.get("Content-Length", 0)) or None,
+                    unit="B",
+                    unit_scale=True,
+                    miniters=1,
+                    desc=url.split("/")[-1],
+                ) as progress_bar,
+            ):
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    progress_bar.update(len(chunk))
+        cache.set(url, get_file_size(fpath))
 
 
 def get_url_size(url: str) -> int | None:
     """Return the size (bytes) of a given URL."""
-    response = requests.head(url)
+    response = _SESSION.head(url)
     content_length = response.headers.get("Content-Length")
     if content_length:
         return int(content_length)
@@ -53,11 +134,24 @@ def get_url_size(url: str) -> int | None:
 
 
 def get_file_size(fpath: Path) -> int:
-    """Return the size (bytes) of a given Path."""
-    if not fpath.exists():
-        return 0
-    else:
+    """Return the size (bytes) of a given Path, or 0 if it does not exist."""
+    try:
         return fpath.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def get_file_sizes(folder: Path) -> dict[Path, int]:
+    """Return the size (bytes) of all files in a folder, using a single scan.
+
+    Listing the folder once is cheaper than checking every (possibly non-existing)
+    file separately, especially on network file systems.
+    """
+    try:
+        with os.scandir(folder) as entries:
+            return {Path(e.path): e.stat().st_size for e in entries if e.is_file()}
+    except FileNotFoundError:
+        return {}
 
 
 def make_grid(spatial_bounds: SpatialBounds, resolution: float) -> xarray_regrid.Grid:
@@ -53,7 +53,7 @@ def compare_variables(
     Raises:
         InvalidVariableError: If the variables are not available in the dataset
     """
-    if not all(var in dataset.variable_names for var in variable_names):
+    if not set(variable_names).issubset(dataset.variable_names):
         raise InvalidVariableError(
             f"Input variable and/or units does not match the {dataset.name} dataset."
         )
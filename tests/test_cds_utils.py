@@ -1,9 +1,13 @@
 """Unit test for cds utils functions."""
 
+import time
 from pathlib import Path
+from unittest.mock import Mock
 from unittest.mock import patch
+import eccodes
 import numpy as np
 import pytest
+import requests
 import xarray as xr
 from zampy.datasets import cds_utils
 from zampy.datasets.dataset_protocol import SpatialBounds
@@ -55,7 +59,7 @@ def test_cds_request_era5(mock_retrieve, valid_path_config):
                 "product_type": "reanalysis",
                 "variable": ["10m_u_component_of_wind"],
                 "year": "2010",
-                "month": "1",
+                "month": ["1"],
                 "day": ALL_DAYS,
                 "time": ALL_HOURS,
                 "area": [
@@ -64,11 +68,236 @@ def test_cds_request_era5(mock_retrieve, valid_path_config):
                     spatial_bounds.south,
                     spatial_bounds.east,
                 ],
-                "format": "netcdf",
+                "format": "grib",
             },
         )
 
 
+@patch("cdsapi.Client.retrieve")
+def test_cds_request_era5_parallel(mock_retrieve, valid_path_config):
+    """Test that every month group/variable combination is requested."""
+    product = "reanalysis-era5-single-levels"
+    variables = ["eastward_component_of_wind", "northward_component_of_wind"]
+    cds_var_names = {
+        "eastward_component_of_wind": "10m_u_component_of_wind",
+        "northward_component_of_wind": "10m_v_component_of_wind",
+    }
+    time_bounds = TimeBounds(
+        np.datetime64("2010-01-01T00:00:00"), np.datetime64("2010-08-31T23:00:00")
+    )
+    spatial_bounds = SpatialBounds(54, 56, 1, 3)
+    path = Path(__file__).resolve().parent
+
+    patching = patch("zampy.datasets.cds_utils.CONFIG_PATH", valid_path_config)
+    with patching:
+        cds_utils.cds_request(
+            product,
+            variables,
+            time_bounds,
+            spatial_bounds,
+            path,
+            cds_var_names,
+            overwrite=True,
+            max_workers=2,
+        )
+
+    requested = {
+        (call.args[1]["variable"][0], tuple(call.args[1]["month"]))
+        for call in mock_retrieve.call_args_list
+    }
+    month_groups = (("1", "2", "3", "4", "5", "6"), ("7", "8"))
+    assert mock_retrieve.call_count == 4
+    assert requested == {
+        (var, months) for var in cds_var_names.values() for months in month_groups
+    }
+
+
+def http_error(status_code):
+    """Create an HTTPError with the given status code."""
+    return requests.exceptions.HTTPError(response=Mock(status_code=status_code))
+
+
+@pytest.mark.parametrize(
+    "error, transient",
+    [
+        (http_error(429), True),
+        (http_error(503), True),
+        (requests.exceptions.ConnectionError(), True),
+        (requests.exceptions.ReadTimeout(), True),
+        (http_error(400), False),
+        (http_error(401), False),
+        (ValueError(), False),
+    ],
+)
+def test_is_transient_error(error, transient):
+    """Test which errors of a CDS request are retried."""
+    assert cds_utils._is_transient_error(error) == transient
+
+
+@patch("cdsapi.Client.retrieve")
+def test_cds_request_invalid_not_retried(mock_retrieve, valid_path_config, tmp_path):
+    """Test that an invalid request is raised directly, without retrying."""
+    mock_retrieve.side_effect = http_error(400)
+    patching = patch("zampy.datasets.cds_utils.CONFIG_PATH", valid_path_config)
+    with patching, pytest.raises(requests.exceptions.HTTPError):
+        cds_utils.cds_request(
+            "reanalysis-era5-single-levels",
+            ["eastward_component_of_wind"],
+            TimeBounds(np.datetime64("2010-01-01"), np.datetime64("2010-01-31")),
+            SpatialBounds(54, 56, 1, 3),
+            tmp_path,
+            {"eastward_component_of_wind": "10m_u_component_of_wind"},
+            overwrite=False,
+        )
+    assert mock_retrieve.call_count == 1
+
+
+@patch("cdsapi.Client.retrieve")
+def test_cds_request_error_cancels_queue(mock_retrieve, valid_path_config, tmp_path):
+    """Test that queued requests are cancelled when a request fails."""
+
+    def failing_request(*args):
+        time.sleep(0.2)  # let the requests queue up, as with a real CDS request
+        raise http_error(400)
+
+    mock_retrieve.side_effect = failing_request
+    cds_var_names = {f"variable_{i}": f"cds_variable_{i}" for i in range(8)}
+    patching = patch("zampy.datasets.cds_utils.CONFIG_PATH", valid_path_config)
+    with patching, pytest.raises(requests.exceptions.HTTPError):
+        cds_utils.cds_request(
+            "reanalysis-era5-single-levels",
+            list(cds_var_names),
+            TimeBounds(np.datetime64("2010-01-01"), np.datetime64("2010-01-31")),
+            SpatialBounds(54, 56, 1, 3),
+            tmp_path,
+            cds_var_names,
+            overwrite=False,
+            max_workers=1,
+        )
+    # The worker may have started on the next request before the queue is cancelled
+    assert mock_retrieve.call_count <= 2
+
+
+@patch("cdsapi.Client.retrieve")
+def test_cds_request_reads_cache_once(mock_retrieve, valid_path_config, tmp_path):
+    """Test that the download cache is read once, not for every requested file."""
+    cds_var_names = {f"variable_{i}": f"cds_variable_{i}" for i in range(8)}
+    patching = patch("zampy.datasets.cds_utils.CONFIG_PATH", valid_path_config)
+    with (
+        patching,
+        patch.object(
+            cds_utils.DownloadCache, "read", autospec=True, return_value={}
+        ) as mock_read,
+    ):
+        cds_utils.cds_request(
+            "reanalysis-era5-single-levels",
+            list(cds_var_names),
+            TimeBounds(np.datetime64("2010-01-01"), np.datetime64("2010-01-31")),
+            SpatialBounds(54, 56, 1, 3),
+            tmp_path,
+            cds_var_names,
+            overwrite=False,
+        )
+    assert mock_retrieve.call_count == len(cds_var_names)
+    assert mock_read.call_count == 1
+
+
+def fake_grib_retrieve(dataset, request):
+    """Fake a CDS request, with a GRIB message for every requested month."""
+    messages = []
+    for month in request["month"]:
+        message = eccodes.codes_grib_new_from_samples("regular_ll_sfc_grib1")
+        eccodes.codes_set(message, "dataDate", int(f"{request['year']}{month:0>2}01"))
+        messages.append(eccodes.codes_get_message(message))
+        eccodes.codes_release(message)
+    data = b"".join(messages)
+    result = Mock(content_length=len(data))
+    result.download.side_effect = lambda fpath: Path(fpath).write_bytes(data)
+    return result
+
+
+@patch("cdsapi.Client.retrieve", side_effect=fake_grib_retrieve)
+def test_cds_request_era5_cached(mock_retrieve, valid_path_config, tmp_path):
+    """Test that complete files are skipped without a CDS request."""
+    args = (
+        "reanalysis-era5-single-levels",
+        ["eastward_component_of_wind"],
+        TimeBounds(np.datetime64("2010-01-01"), np.datetime64("2010-01-31")),
+        SpatialBounds(54, 56, 1, 3),
+        tmp_path,
+        {"eastward_component_of_wind": "10m_u_component_of_wind"},
+    )
+
+    patching = patch("zampy.datasets.cds_utils.CONFIG_PATH", valid_path_config)
+    with patching:
+        cds_utils.cds_request(*args, overwrite=False)
+        assert mock_retrieve.call_count == 1
+
+        cds_utils.cds_request(*args, overwrite=False)
+        assert mock_retrieve.call_count == 1
+
+        cds_utils.cds_request(*args, overwrite=True)
+        assert mock_retrieve.call_count == 2
+
+
+@patch("cdsapi.Client.retrieve", side_effect=fake_grib_retrieve)
+def test_cds_request_era5_monthly_files(mock_retrieve, valid_path_config, tmp_path):
+    """Test that downloads are split per month, and reused for other time bounds."""
+    args = (
+        "reanalysis-era5-single-levels",
+        ["eastward_component_of_wind"],
+    )
+    kwargs = {
+        "spatial_bounds": SpatialBounds(54, 56, 1, 3),
+        "path": tmp_path,
+        "cds_var_names": {"eastward_component_of_wind": "10m_u_component_of_wind"},
+        "overwrite": False,
+    }
+
+    patching = patch("zampy.datasets.cds_utils.CONFIG_PATH", valid_path_config)
+    with patching:
+        cds_utils.cds_request(
+            *args,
+            time_bounds=TimeBounds(
+                np.datetime64("2020-03-15"), np.datetime64("2020-12-31")
+            ),
+            **kwargs,
+        )
+        requested = [call.args[1]["month"] for call in mock_retrieve.call_args_list]
+        assert sorted(requested) == [
+            ["3", "4", "5", "6", "7", "8"],
+            ["9", "10", "11", "12"],
+        ]
+        assert sorted(fpath.name for fpath in tmp_path.glob("*.grib*")) == sorted(
+            f"era5_eastward_component_of_wind_2020-{month}.grib"
+            for month in range(3, 13)
+        )
+
+        mock_retrieve.reset_mock()
+        cds_utils.cds_request(
+            *args,
+            time_bounds=TimeBounds(
+                np.datetime64("2020-01-01"), np.datetime64("2020-12-31")
+            ),
+            **kwargs,
+        )
+        mock_retrieve.assert_called_once()
+        assert mock_retrieve.call_args.args[1]["month"] == ["1", "2"]
+    assert not list(tmp_path.glob("*.part"))
+
+
+def test_split_grib_months(tmp_path):
+    """Test splitting a GRIB file into a file per month."""
+    fpath = data_folder / "era5-grib" / "era5_total_precipitation_2020-1.grib"
+    month_paths = {
+        "1": tmp_path / "january.grib",
+        "2": tmp_path / "february.grib",
+    }
+    cds_utils.split_grib_months(fpath, month_paths)
+    assert month_paths["1"].read_bytes() == fpath.read_bytes()
+    assert not month_paths["2"].exists()
+
+
 @patch("cdsapi.Client.retrieve")
 def test_cds_request_cams_co2(mock_retrieve, valid_path_config):
     """ "Test cds request for downloading data from CDS server."""
@@ -166,6 +395,65 @@ def test_cds_api_key_config_apikey_not_exist(tmp_path_factory):
             cds_utils.cds_api_key("era5")
 
 
+def test_cds_api_key_config_modified(valid_path_config):
+    """Test that changes to the (cached) zampy config are picked up."""
+    patching = patch("zampy.datasets.cds_utils.CONFIG_PATH", valid_path_config)
+    with patching:
+        assert cds_utils.cds_api_key("era5") == ("a", "123:abc-def")
+
+        with open(valid_path_config, mode="w", encoding="utf-8") as f:
+            f.write("cdsapi:\n  url: b\n  key: 456:abc-def\n")
+        assert cds_utils.cds_api_key("era5") == ("b", "456:abc-def")
+
+
+@patch("cdsapi.Client.retrieve", side_effect=fake_grib_retrieve)
+def test_cds_request_era5_recent_not_cached(mock_retrieve, valid_path_config, tmp_path):
+    """Test that recent data, which can still change on the server, is not cached."""
+    today = np.datetime64("today")
+    args = (
+        "reanalysis-era5-single-levels",
+        ["eastward_component_of_wind"],
+        TimeBounds(today, today),
+        SpatialBounds(54, 56, 1, 3),
+        tmp_path,
+        {"eastward_component_of_wind": "10m_u_component_of_wind"},
+    )
+
+    patching = patch("zampy.datasets.cds_utils.CONFIG_PATH", valid_path_config)
+    with patching:
+        cds_utils.cds_request(*args, overwrite=False)
+        cds_utils.cds_request(*args, overwrite=False)
+    assert mock_retrieve.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "request_, final",
+    [
+        ({"year": "2010", "month": ["1", "2"]}, True),
+        ({"year": "2010"}, True),
+        ({"date": "2010-01-01/2010-12-31"}, True),
+        ({"year": "2100", "month": ["1", "2"]}, False),
+        ({"year": "2100"}, False),
+        ({"date": "2010-01-01/2100-12-31"}, False),
+    ],
+)
+def test_is_final(request_, final):
+    """Test if the period of a request is (not) past the publication delay."""
+    assert cds_utils._is_final(request_) == final
+
+
+def test_pooled_client():
+    """Test that idle clients are reused, but never shared at the same time."""
+    # Use a separate url: the pool also holds the clients of the other tests.
+    url = "test_pooled_client"
+    with cds_utils._pooled_client(url, "123:abc-def") as client:
+        with cds_utils._pooled_client(url, "123:abc-def") as other_client:
+            assert client is not other_client
+
+    with cds_utils._pooled_client(url, "123:abc-def") as reused_client:
+        assert reused_client in (client, other_client)
+
+
 def test_time_bounds_to_year_month():
     """Test year and month pair converter function."""
     times = TimeBounds(np.datetime64("2010-01-01"), np.datetime64("2010-01-31"))
@@ -174,6 +462,25 @@ def test_time_bounds_to_year_month():
     assert expected == year_month_pairs
 
 
+def test_time_bounds_to_year_month_partial_months():
+    """Test that partially covered months are included."""
+    times = TimeBounds(np.datetime64("2010-11-15"), np.datetime64("2011-02-01"))
+    expected = [("2010", "11"), ("2010", "12"), ("2011", "1"), ("2011", "2")]
+    year_month_pairs = cds_utils.time_bounds_to_year_month(times)
+    assert expected == year_month_pairs
+
+
+def test_group_year_months():
+    """Test grouping of months per year."""
+    year_months = [("2010", "10"), ("2010", "11"), ("2010", "12"), ("2011", "1")]
+    expected = [
+        ("2010", ["10", "11"]),
+        ("2010", ["12"]),
+        ("2011", ["1"]),
+    ]
+    assert cds_utils.group_year_months(year_months, group_size=2) == expected
+
+
 @pytest.fixture(scope="function")
 def dummy_dir(tmp_path_factory):
     """Create a dummpy directory for testing."""
@@ -189,11 +496,59 @@ def test_convert_to_zampy(dummy_dir):
         overwrite=True,
     )
 
-    ds = xr.open_dataset(Path(dummy_dir, "era5_northward_component_of_wind_2020-1.nc"))
+    ds = xr.open_zarr(Path(dummy_dir, "era5_northward_component_of_wind_2020-1.zarr"))
 
     assert list(ds.data_vars)[0] == "northward_component_of_wind"
 
 
+def test_convert_to_zampy_rechunk(dummy_dir):
+    """Test the chunking of the zarr store written by convert_to_zampy."""
+    file = Path(data_folder, "era5", "era5_northward_component_of_wind_2020-1.nc")
+    cds_utils.convert_to_zampy(ingest_folder=Path(dummy_dir), file=file)
+    ds = xr.open_zarr(Path(dummy_dir, "era5_northward_component_of_wind_2020-1.zarr"))
+    assert ds["northward_component_of_wind"].encoding["chunks"] == (4, 4, 4)
+
+    cds_utils.convert_to_zampy(
+        ingest_folder=Path(dummy_dir),
+        file=file,
+        overwrite=True,
+        chunks={"valid_time": 1, "latitude": 2, "longitude": 2},
+    )
+    ds = xr.open_zarr(Path(dummy_dir, "era5_northward_component_of_wind_2020-1.zarr"))
+    assert ds["northward_component_of_wind"].encoding["chunks"] == (1, 2, 2)
+
+
+def test_convert_many(dummy_dir):
+    """Test converting multiple files to zarr stores in parallel."""
+    files = list(Path(data_folder, "era5").glob("era5_*_wind_2020-1.nc"))
+    cds_utils.convert_many(ingest_folder=Path(dummy_dir), files=files)
+    for file in files:
+        assert Path(dummy_dir, file.with_suffix(".zarr").name).exists()
+
+
+def test_convert_many_chunks(dummy_dir):
+    """Test that the chunk sizes are passed on to the written zarr stores."""
+    files = list(Path(data_folder, "era5").glob("era5_*_wind_2020-1.nc"))
+    cds_utils.convert_many(
+        ingest_folder=Path(dummy_dir),
+        files=files,
+        chunks={"valid_time": 1, "latitude": 2, "longitude": 2},
+    )
+    for file in files:
+        ds = xr.open_zarr(Path(dummy_dir, file.with_suffix(".zarr").name))
+        for var in ds.data_vars:
+            assert ds[var].encoding["chunks"] == (1, 2, 2)
+
+
+def test_open_raw_file_grib():
+    """Test that GRIB files are opened with the same dimensions as the nc files."""
+    ds = cds_utils.open_raw_file(
+        data_folder / "era5-grib" / "era5_total_precipitation_2020-1.grib"
+    )
+    assert set(ds.dims) == {"valid_time", "latitude", "longitude"}
+    assert list(ds.coords) == ["valid_time", "latitude", "longitude"]
+
+
 class TestParser:
     """Test parsing netcdf files for all relevant variables."""
 
@@ -248,6 +603,21 @@ class TestParser:
             equal_nan=True,
         )
 
+    def test_parse_grib_file_precipitation(self):
+        """Test parsing a GRIB file, in which cfgrib names mtpr 'avg_tprate'."""
+        ds_nc = cds_utils.parse_nc_file(
+            data_folder / "era5" / "era5_total_precipitation_2020-1.nc"
+        )
+        ds = cds_utils.parse_nc_file(
+            data_folder / "era5-grib" / "era5_total_precipitation_2020-1.grib"
+        )
+
+        assert list(ds.data_vars) == ["total_precipitation"]
+        assert ds["total_precipitation"].attrs["units"] == "millimeter_per_second"
+        np.testing.assert_allclose(
+            ds["total_precipitation"].values, ds_nc["total_precipitation"].values
+        )
+
     def test_parse_nc_file_pressure(self):
         """Test parsing netcdf file function with surface pressure."""
         ds = cds_utils.parse_nc_file(
@@ -258,6 +628,23 @@ class TestParser:
         assert list(ds.data_vars)[0] == expected_var_name
         assert ds["surface_pressure"].attrs["units"] == "pascal"
 
+    def test_parse_nc_file_chunks(self):
+        """Test that the file is read with the requested chunks."""
+        ds = cds_utils.parse_nc_file(
+            data_folder / "era5" / "era5_surface_pressure_2020-1.nc",
+            chunks={"valid_time": 1, "latitude": 2, "longitude": 2},
+        )
+        assert ds["surface_pressure"].chunks == ((1, 1, 1, 1), (2, 2), (2, 2))
+
+    def test_parse_nc_file_drop_unused(self):
+        """Test that auxiliary variables are not loaded."""
+        ds = cds_utils.parse_nc_file(
+            data_folder / "era5" / "era5_surface_pressure_2020-1.nc"
+        )
+        assert "expver" not in ds.variables
+        assert "number" not in ds.variables
+        assert set(ds.dims) == {"valid_time", "latitude", "longitude"}
+
     def test_parse_nc_file_air_temperature(self):
         """Test parsing netcdf file function with 2 meter temperature."""
         ds = cds_utils.parse_nc_file(
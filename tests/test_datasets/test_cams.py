@@ -94,7 +94,7 @@ class TestCAMS:
             Path(
                 dummy_dir,
                 "cams",
-                "cams_co2_concentration_2020_01_01-2020_02_15.nc",
+                "cams_co2_concentration_2020_01_01-2020_02_15.zarr",
             )
         )
 
@@ -1,6 +1,7 @@
 """Unit test for ERA5 dataset."""
 
 import json
+import shutil
 from pathlib import Path
 from unittest.mock import patch
 import numpy as np
@@ -9,6 +10,7 @@ import xarray as xr
 from tests import ALL_DAYS
 from tests import ALL_HOURS
 from tests import data_folder
+from zampy.datasets import cds_utils
 from zampy.datasets.catalog import ERA5
 from zampy.datasets.dataset_protocol import SpatialBounds
 from zampy.datasets.dataset_protocol import TimeBounds
@@ -63,7 +65,7 @@ class TestERA5:
                     "product_type": "reanalysis",
                     "variable": cds_var_names,
                     "year": "2020",
-                    "month": "1",
+                    "month": ["1", "2"],
                     # fmt: off
                     "day": ALL_DAYS,
                     "time": ALL_HOURS,
@@ -74,7 +76,7 @@ class TestERA5:
                         bbox.south,
                         bbox.east,
                     ],
-                    "format": "netcdf",
+                    "format": "grib",
                 },
             )
 
@@ -100,7 +102,7 @@ class TestERA5:
             Path(
                 dummy_dir,
                 "era5",
-                "era5_northward_component_of_wind_2020-1.nc",
+                "era5_northward_component_of_wind_2020-1.zarr",
             )
         )
         assert isinstance(ds, xr.Dataset)
@@ -131,6 +133,50 @@ class TestERA5:
         # check if valid_time not in the dataset
         assert "valid_time" not in ds.dims
 
+    def test_ingest_legacy_netcdf_and_grib(self, dummy_dir):
+        """Test that a netCDF file is skipped if a GRIB file covers the same month."""
+        download_folder = Path(dummy_dir, "download", "era5")
+        shutil.copytree(data_folder / "era5", download_folder)
+        grib_file = download_folder / "era5_total_precipitation_2020-1.grib"
+        shutil.copy(data_folder / "era5-grib" / grib_file.name, grib_file)
+        ingest_dir = Path(dummy_dir, "ingest")
+
+        with patch.object(
+            cds_utils, "convert_many", wraps=cds_utils.convert_many
+        ) as mock_convert:
+            ERA5().ingest(download_dir=download_folder.parent, ingest_dir=ingest_dir)
+        files = mock_convert.call_args.kwargs["files"]
+        assert grib_file in files
+        assert download_folder / "era5_total_precipitation_2020-1.nc" not in files
+
+        ds = ERA5().load(
+            ingest_dir=ingest_dir,
+            time_bounds=TimeBounds(
+                np.datetime64("2020-01-01"), np.datetime64("2020-01-04")
+            ),
+            spatial_bounds=SpatialBounds(60.0, 0.3, 59.7, 0.0),
+            variable_names=["total_precipitation"],
+            resolution=0.1,
+        )
+        assert "total_precipitation" in ds
+
+    def test_load_legacy_netcdf(self, dummy_dir):
+        """Test that data ingested as netCDF by older versions raises an error."""
+        ingest_folder = Path(dummy_dir, "era5")
+        ingest_folder.mkdir()
+        Path(ingest_folder, "era5_northward_component_of_wind_2020-1.nc").touch()
+
+        with pytest.raises(FileNotFoundError, match="ingest the data again"):
+            ERA5().load(
+                ingest_dir=Path(dummy_dir),
+                time_bounds=TimeBounds(
+                    np.datetime64("2020-01-01"), np.datetime64("2020-01-04")
+                ),
+                spatial_bounds=SpatialBounds(60.0, 0.3, 59.7, 0.0),
+                variable_names=["northward_component_of_wind"],
+                resolution=0.1,
+            )
+
     def test_convert(self, dummy_dir):
         """Test convert function."""
         era5_dataset = self.ingest_dummy_data(dummy_dir)
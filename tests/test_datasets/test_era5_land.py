@@ -63,7 +63,7 @@ class TestERA5Land:
                     "product_type": "reanalysis",
                     "variable": cds_var_names,
                     "year": "2020",
-                    "month": "1",
+                    "month": ["1", "2"],
                     "day": ALL_DAYS,
                     "time": ALL_HOURS,
                     "area": [
@@ -72,7 +72,7 @@ class TestERA5Land:
                         bbox.south,
                         bbox.east,
                     ],
-                    "format": "netcdf",
+                    "format": "grib",
                 },
             )
 
@@ -98,7 +98,7 @@ class TestERA5Land:
             Path(
                 dummy_dir,
                 "era5-land",
-                "era5-land_dewpoint_temperature_2020-1.nc",
+                "era5-land_dewpoint_temperature_2020-1.zarr",
             )
         )
         assert isinstance(ds, xr.Dataset)
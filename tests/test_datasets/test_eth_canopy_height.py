@@ -21,8 +21,8 @@ def dummy_dir(tmp_path_factory):
 class TestEthCanopyHeight:
     """Test the EthCanopyHeight class."""
 
-    @patch("urllib.request.urlretrieve")
-    def test_download(self, mock_urlretrieve, dummy_dir):
+    @patch("requests.Session.get")
+    def test_download(self, mock_get, dummy_dir):
         """Test download functionality.
 
         Here we mock the downloading and save property file to a fake path.
@@ -41,7 +41,7 @@ class TestEthCanopyHeight:
         )
 
         # make sure that the download is called
-        assert mock_urlretrieve.called
+        assert mock_get.called
 
         # check property file
         with (download_dir / "eth-canopy-height" / "properties.json").open(
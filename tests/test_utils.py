@@ -1,22 +1,16 @@
 """Unit test for utils functions."""
 
+import json
 import tempfile
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
 from pathlib import Path
 from unittest.mock import patch
 from zampy.datasets import utils
 
 
-def test_tqdm_update():
-    """Test tqdm function."""
-    # Create an instance of TqdmUpdate
-    progress_bar = utils.TqdmUpdate(total=100)
-    progress_bar.update_to(10, 10)
-
-    # Assert that the progress bar's value has been updated correctly
-    assert progress_bar.n == 100
-
-
-@patch("requests.head")
+@patch("requests.Session.head")
 def test_get_url_size(mock_head):
     """Test url size function."""
     url = "https://example.com/test_file.txt"
@@ -55,14 +49,106 @@ def test_get_file_size_not_exist():
     assert size == 0
 
 
-@patch("urllib.request.urlretrieve")
-def test_download_url(mock_urlretrieve):
+def test_get_file_sizes(tmp_path):
+    """Test the sizes of all files in a folder."""
+    (tmp_path / "a.nc").write_bytes(b"0" * 1024)
+    (tmp_path / "b.nc").write_bytes(b"0" * 16)
+    (tmp_path / "subfolder").mkdir()
+    assert utils.get_file_sizes(tmp_path) == {
+        tmp_path / "a.nc": 1024,
+        tmp_path / "b.nc": 16,
+    }
+    assert utils.get_file_sizes(tmp_path / "non_existing_folder") == {}
+
+
+@patch("requests.Session.get")
+def test_download_url(mock_get, tmp_path):
     """Test download function."""
     # fake test data
     url = "https://example.com/test_file.txt"
-    fpath = Path("test_file.txt")
+    fpath = tmp_path / "test_file.txt"
     overwrite = True
 
+    response = mock_get.return_value.__enter__.return_value
+    response.headers = {"Content-Length": "2048"}
+    response.iter_content.return_value = [b"0" * 1024, b"0" * 1024]
+
     utils.download_url(url, fpath, overwrite)
-    # assrt that the urlretrieve function is called.
-    assert mock_urlretrieve.called
+    # assert that the file is requested and written to disk.
+    mock_get.assert_called_once_with(url, stream=True)
+    assert utils.get_file_size(fpath) == 2048
+
+
+def test_download_cache(tmp_path):
+    """Test storing and retrieving content lengths from the download cache."""
+    cache = utils.DownloadCache(tmp_path)
+    assert cache.get("https://example.com/test_file.txt") is None
+
+    cache.set("https://example.com/test_file.txt", 1024)
+    assert (
+        utils.DownloadCache(tmp_path).get("https://example.com/test_file.txt") == 1024
+    )
+
+
+def test_download_cache_expiry(tmp_path):
+    """Test that cache entries expire."""
+    url = "https://example.com/test_file.txt"
+    cached = datetime.now(timezone.utc) - utils.CACHE_MAX_AGE - timedelta(hours=1)
+    (tmp_path / utils.CACHE_FNAME).write_text(
+        json.dumps(
+            {"downloads": {url: {"content_length": 1024, "cached": cached.isoformat()}}}
+        ),
+        encoding="utf-8",
+    )
+    assert utils.DownloadCache(tmp_path).get(url) is None
+
+
+def test_download_cache_old_format(tmp_path):
+    """Test that a cache file written by an older version of zampy is ignored."""
+    url = "https://example.com/test_file.txt"
+    (tmp_path / utils.CACHE_FNAME).write_text(
+        json.dumps({"zampy_version": "0.2.0", "content_length": {url: 1024}}),
+        encoding="utf-8",
+    )
+    assert utils.DownloadCache(tmp_path).get(url) is None
+
+
+def test_download_cache_corrupt(tmp_path):
+    """Test that a truncated cache file is treated as empty, and is replaced."""
+    (tmp_path / utils.CACHE_FNAME).write_text('{"zampy_version": "0.', encoding="utf-8")
+    cache = utils.DownloadCache(tmp_path)
+    assert cache.get("https://example.com/test_file.txt") is None
+
+    cache.set("https://example.com/test_file.txt", 1024)
+    assert cache.get("https://example.com/test_file.txt") == 1024
+    assert [f.name for f in tmp_path.iterdir()] == [utils.CACHE_FNAME]
+
+
+@patch("requests.Session.head")
+@patch("requests.Session.get")
+def test_download_url_cached(mock_get, mock_head, tmp_path):
+    """Test that a cached, complete file is not requested again."""
+    url = "https://example.com/test_file.txt"
+    fpath = tmp_path / "test_file.txt"
+    fpath.write_bytes(b"0" * 1024)
+    utils.DownloadCache(tmp_path).set(url, 1024)
+
+    with patch.object(utils.DownloadCache, "set") as mock_set:
+        utils.download_url(url, fpath, overwrite=False)
+    assert not mock_head.called
+    assert not mock_get.called
+    assert not mock_set.called  # the cache file is not rewritten
+
+
+@patch("requests.Session.head")
+@patch("requests.Session.get")
+def test_download_url_cache_miss(mock_get, mock_head, tmp_path):
+    """Test that a complete, but uncached, file is added to the cache."""
+    url = "https://example.com/test_file.txt"
+    fpath = tmp_path / "test_file.txt"
+    fpath.write_bytes(b"0" * 1024)
+    mock_head.return_value.headers = {"Content-Length": "1024"}
+
+    utils.download_url(url, fpath, overwrite=False)
+    assert not mock_get.called
+    assert utils.DownloadCache(tmp_path).get(url) == 1024